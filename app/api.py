@@ -12,7 +12,7 @@ from typing import List, Optional
 from datetime import datetime
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, Query, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from .models import (
     UploadResponse, 
@@ -142,6 +142,17 @@ async def health_check():
         }
 
 
+@router.head("/health", tags=["Health"])
+async def health_probe():
+    """
+    Lightweight liveness probe for HEAD requests.
+    
+    Skips the vectorstore statistics gathered by the GET handler, so clients
+    that only need to know whether the API is up pay no body or scan cost.
+    """
+    return Response(status_code=200)
+
+
 @router.post(
     "/upload", 
     response_model=UploadResponse,
@@ -422,6 +422,33 @@ def process_csv(file_path: str, filename: str) -> List[Document]:
     return loader.load()
 
 
+def flatten_to_rgb(image: Image.Image) -> Image.Image:
+    """
+    Flatten images with transparency or a palette onto a white background.
+    
+    Args:
+        image: PIL image in any mode
+        
+    Returns:
+        RGB image (the input is returned unchanged if no flattening is needed)
+    """
+    if image.mode not in ('RGBA', 'LA', 'P'):
+        return image
+    
+    # Opaque images (no palette transparency, alpha all 255) only need a channel conversion
+    if image.mode == 'P':
+        is_opaque = 'transparency' not in image.info
+    else:
+        is_opaque = image.getchannel('A').getextrema() == (255, 255)
+    if is_opaque:
+        return image.convert('RGB')
+    
+    # alpha_composite blends in C without extracting a separate mask band
+    rgba = image.convert('RGBA')
+    background = Image.new('RGBA', rgba.size, (255, 255, 255, 255))
+    return Image.alpha_composite(background, rgba).convert('RGB')
+
+
 def analyze_image_with_vision(file_path: str, filename: str) -> str:
     """
     Analyze an image using GPT Vision when OCR cannot extract text.
@@ -436,34 +463,38 @@ def analyze_image_with_vision(file_path: str, filename: str) -> str:
     logger.info(f"Analyzing image with GPT Vision: {filename}")
     
     try:
-        # Read and encode the image
-        with open(file_path, "rb") as image_file:
-            image_data = image_file.read()
-        
         # Resize image if too large (max 2048px on longest side for efficiency)
         image = Image.open(file_path)
         max_size = 2048
+        mime_type = Image.MIME.get(image.format, "image/jpeg")
         if max(image.size) > max_size:
-            ratio = max_size / max(image.size)
-            new_size = tuple(int(dim * ratio) for dim in image.size)
-            image = image.resize(new_size, Image.Resampling.LANCZOS)
+            # Let libjpeg decode at a reduced DCT scale before resampling
+            if image.format == "JPEG":
+                image.draft("RGB", (max_size, max_size))
+            # reducing_gap pre-shrinks with a cheap box filter; BICUBIC keeps text legible
+            # for the vision model at a fraction of LANCZOS's kernel cost
+            image.thumbnail((max_size, max_size), Image.Resampling.BICUBIC, reducing_gap=3.0)
             
             # Save resized image to buffer
             buffer = io.BytesIO()
             # Convert to RGB if necessary
-            if image.mode in ('RGBA', 'LA', 'P'):
-                background = Image.new('RGB', image.size, (255, 255, 255))
-                if image.mode == 'P':
-                    image = image.convert('RGBA')
-                if image.mode == 'RGBA':
-                    background.paste(image, mask=image.split()[-1])
-                else:
-                    background.paste(image)
-                image = background
-            image.save(buffer, format="JPEG", quality=85)
-            image_data = buffer.getvalue()
-        
-        image_base64 = base64.b64encode(image_data).decode()
+            image = flatten_to_rgb(image)
+            # Progressive mode (which always builds optimized Huffman tables) with 4:2:0
+            # chroma keeps the payload small
+            image.save(buffer, format="JPEG", quality=80, progressive=True, subsampling=2)
+            # Zero-copy view of the encoded bytes; b64encode accepts memoryviews
+            image_data = buffer.getbuffer()
+            mime_type = "image/jpeg"
+        else:
+            # Already small enough - send the original bytes instead of re-encoding,
+            # which would cost CPU and often produce a larger, lossier file
+            with open(file_path, "rb") as image_file:
+                image_data = image_file.read()
+        
+        # Build the data URL in one step and drop the raw bytes before the API
+        # call, so only one image-sized string stays alive during the request
+        image_url = f"data:{mime_type};base64," + base64.b64encode(image_data).decode("ascii")
+        del image_data
         
         client = get_openai_client()
         
@@ -487,7 +518,7 @@ Provide a comprehensive description that can be used for document retrieval and
                         {
                             "type": "image_url",
                             "image_url": {
-                                "url": f"data:image/jpeg;base64,{image_base64}",
+                                "url": image_url,
                                 "detail": "high"
                             }
                         }
@@ -529,15 +560,7 @@ def process_image(file_path: str, filename: str) -> List[Document]:
         image = Image.open(file_path)
         
         # Convert to RGB if necessary for better OCR
-        if image.mode in ('RGBA', 'LA', 'P'):
-            background = Image.new('RGB', image.size, (255, 255, 255))
-            if image.mode == 'P':
-                image = image.convert('RGBA')
-            if image.mode == 'RGBA':
-                background.paste(image, mask=image.split()[-1])
-            else:
-                background.paste(image)
-            image = background
+        image = flatten_to_rgb(image)
         
         # Perform OCR
         text = pytesseract.image_to_string(image)
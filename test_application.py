@@ -162,6 +162,39 @@ def test_api_health():
         return False
 
 
+def test_api_health_head():
+    """Test the lightweight HEAD health probe."""
+    start = time.time()
+    try:
+        response = requests.head(f"{API_BASE_URL}/health", timeout=TIMEOUT)
+        duration = (time.time() - start) * 1000
+        
+        # The probe must answer 200 with no body (the UI uses it as its liveness check)
+        if response.status_code == 200 and not response.content:
+            runner.add_result(TestResult(
+                name="API Health Probe (HEAD)",
+                passed=True,
+                message="HEAD /health answered 200 with an empty body",
+                duration_ms=duration
+            ))
+            return True
+        else:
+            runner.add_result(TestResult(
+                name="API Health Probe (HEAD)",
+                passed=False,
+                message=f"Status: {response.status_code}, body bytes: {len(response.content)}",
+                duration_ms=duration
+            ))
+            return False
+    except Exception as e:
+        runner.add_result(TestResult(
+            name="API Health Probe (HEAD)",
+            passed=False,
+            message=f"Exception: {str(e)}"
+        ))
+        return False
+
+
 def test_file_upload(file_type: str = "text") -> Optional[str]:
     """Test file upload functionality."""
     test_file = TEST_FILES.get(file_type)
@@ -409,6 +442,7 @@ def main():
     
     # Run tests
     test_api_health()
+    test_api_health_head()
     test_list_files()
     test_invalid_file_type()
     test_empty_query()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the image helpers in app.logic.
+Covers transparency flattening and the GPT Vision upload path without
+calling the OpenAI API.
+
+Run with: python -m pytest test_logic.py
+"""
+
+import base64
+import io
+import os
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+# Settings validation rejects a missing or placeholder key at import time
+os.environ.setdefault("OPENAI_API_KEY", "sk-test-key-for-unit-tests")
+
+from app import logic  # noqa: E402
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+class FakeOpenAIClient:
+    """Records the chat completion request instead of sending it."""
+
+    def __init__(self):
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.requests.append(kwargs)
+        message = SimpleNamespace(content="A test image")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    def sent_image_url(self) -> str:
+        """Data URL of the image in the last request."""
+        content = self.requests[-1]["messages"][0]["content"]
+        return next(part["image_url"]["url"] for part in content if part["type"] == "image_url")
+
+
+def decode_data_url(url: str):
+    """Split a base64 data URL into its MIME type and raw bytes."""
+    header, encoded = url.split(",", 1)
+    assert header.startswith("data:") and header.endswith(";base64")
+    return header[len("data:"):-len(";base64")], base64.b64decode(encoded)
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    """Replace the OpenAI client singleton for one test."""
+    client = FakeOpenAIClient()
+    monkeypatch.setattr(logic, "get_openai_client", lambda: client)
+    return client
+
+
+# =============================================================================
+# flatten_to_rgb
+# =============================================================================
+
+def test_flatten_rgba_composites_onto_white():
+    """Transparent pixels become white, semi-transparent ones are blended."""
+    image = Image.new("RGBA", (2, 1), (255, 0, 0, 0))
+    image.putpixel((1, 0), (255, 0, 0, 128))
+
+    result = logic.flatten_to_rgb(image)
+
+    assert result.mode == "RGB"
+    assert result.getpixel((0, 0)) == (255, 255, 255)
+    red, green, blue = result.getpixel((1, 0))
+    assert red == 255
+    assert 125 <= green <= 129 and green == blue
+
+
+def test_flatten_opaque_rgba_keeps_pixels():
+    """Fully opaque RGBA images only drop the alpha channel."""
+    image = Image.new("RGBA", (2, 2), (10, 20, 30, 255))
+
+    result = logic.flatten_to_rgb(image)
+
+    assert result.mode == "RGB"
+    assert result.getpixel((1, 1)) == (10, 20, 30)
+
+
+def test_flatten_palette_with_transparency():
+    """The transparent palette index is flattened to white."""
+    image = Image.new("P", (2, 1), 0)
+    image.putpalette([0, 0, 0, 0, 0, 255] + [0, 0, 0] * 254)
+    image.putpixel((1, 0), 1)
+    image.info["transparency"] = 0
+
+    result = logic.flatten_to_rgb(image)
+
+    assert result.mode == "RGB"
+    assert result.getpixel((0, 0)) == (255, 255, 255)
+    assert result.getpixel((1, 0)) == (0, 0, 255)
+
+
+def test_flatten_leaves_rgb_untouched():
+    """RGB input is returned as is."""
+    image = Image.new("RGB", (1, 1), (1, 2, 3))
+
+    assert logic.flatten_to_rgb(image) is image
+
+
+# =============================================================================
+# analyze_image_with_vision
+# =============================================================================
+
+def test_vision_downscales_large_jpeg(tmp_path, fake_client):
+    """Images over 2048px are resized to fit and re-encoded as JPEG."""
+    path = tmp_path / "large.jpg"
+    Image.new("RGB", (3000, 1500), (200, 100, 50)).save(path, format="JPEG")
+
+    description = logic.analyze_image_with_vision(str(path), "large.jpg")
+
+    assert "A test image" in description
+    mime_type, data = decode_data_url(fake_client.sent_image_url())
+    assert mime_type == "image/jpeg"
+    sent = Image.open(io.BytesIO(data))
+    assert sent.format == "JPEG"
+    assert max(sent.size) == 2048
+    assert sent.size[0] == 2 * sent.size[1]
+
+
+def test_vision_flattens_large_transparent_png(tmp_path, fake_client):
+    """Oversized RGBA images are flattened before the JPEG re-encode."""
+    path = tmp_path / "large.png"
+    Image.new("RGBA", (2500, 100), (0, 0, 0, 0)).save(path, format="PNG")
+
+    logic.analyze_image_with_vision(str(path), "large.png")
+
+    mime_type, data = decode_data_url(fake_client.sent_image_url())
+    assert mime_type == "image/jpeg"
+    sent = Image.open(io.BytesIO(data))
+    assert sent.mode == "RGB"
+    assert max(sent.size) == 2048
+    # Fully transparent input comes out (near) white after JPEG compression
+    assert all(channel >= 250 for channel in sent.getpixel((10, 10)))
+
+
+@pytest.mark.parametrize("image_format, mime_type", [("PNG", "image/png"), ("JPEG", "image/jpeg")])
+def test_vision_passes_small_images_through(tmp_path, fake_client, image_format, mime_type):
+    """Images within the size limit are sent byte-for-byte with their own MIME type."""
+    path = tmp_path / f"small.{image_format.lower()}"
+    Image.new("RGB", (64, 32), (0, 128, 255)).save(path, format=image_format)
+
+    logic.analyze_image_with_vision(str(path), path.name)
+
+    sent_mime, data = decode_data_url(fake_client.sent_image_url())
+    assert sent_mime == mime_type
+    assert data == path.read_bytes()
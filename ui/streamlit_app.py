@@ -3,13 +3,19 @@ Streamlit frontend for the Multi-Modal RAG application.
 Enhanced with improved UI/UX, error handling, chat history, and performance optimizations.
 """
 
+import re
+import html
 import time
+from copy import copy
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from requests_toolbelt import MultipartEncoder
 import streamlit as st
-from PIL import Image
-import json
+import orjson
 
 # =============================================================================
 # Configuration
@@ -60,568 +66,160 @@ API_BASE_URL = os.getenv(
 # Request timeout configuration
 REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "60"))  # seconds
 HEALTH_CHECK_TIMEOUT = int(os.getenv("HEALTH_CHECK_TIMEOUT", "5"))  # seconds
+FILE_LIST_TIMEOUT = int(os.getenv("FILE_LIST_TIMEOUT", "10"))  # seconds
+BACKEND_POOL_WORKERS = int(os.getenv("BACKEND_POOL_WORKERS", "16"))  # Shared by all sessions
+CIRCUIT_BREAKER_COOLDOWN = int(os.getenv("CIRCUIT_BREAKER_COOLDOWN", "15"))  # seconds
+CHAT_PAGE_SIZE = 50  # Messages rendered per "load earlier" step
+# Messages kept per session; at least 2 so the latest question/answer pair survives
+MAX_CHAT_HISTORY = max(int(os.getenv("MAX_CHAT_HISTORY", "100")), 2)
 
 # =============================================================================
 # Custom CSS Styling
 # =============================================================================
 
+# Stylesheet lives in styles.css next to this file; read once at import
+_CUSTOM_CSS = Path(__file__).with_name("styles.css").read_text(encoding="utf-8")
+
+# Comments and indentation only add bytes to every rerun, so strip them once
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_CSS_WHITESPACE_RE = re.compile(r"\s+")
+_CSS_PUNCTUATION_RE = re.compile(r"\s*([;{},>])\s*")
+# Only the space after a colon is dropped: the space before one is a descendant
+# combinator in selectors like ".a :hover"
+_CSS_COLON_RE = re.compile(r":\s+")
+
+_CSS_MIN = "<style>" + _CSS_COLON_RE.sub(":", _CSS_PUNCTUATION_RE.sub(
+    r"\1", _CSS_WHITESPACE_RE.sub(" ", _CSS_COMMENT_RE.sub("", _CUSTOM_CSS))
+)).strip() + "</style>"
+
 def apply_custom_styles():
     """
     Apply modern conversational AI styling inspired by ChatGPT/Gemini.
     Clean, minimal chat-focused design with smooth animations.
     """
-    st.markdown("""
-    <style>
-        /* ===== ROOT VARIABLES ===== */
-        :root {
-            /* Colors - Professional Blue theme */
-            --primary-500: #2563eb;      /* Primary blue */
-            --primary-600: #1d4ed8;
-            --primary-700: #1e40af;
-            
-            /* Neutral palette */
-            --neutral-50: #f9fafb;
-            --neutral-100: #f3f4f6;
-            --neutral-200: #e5e7eb;
-            --neutral-300: #d1d5db;
-            --neutral-400: #9ca3af;
-            --neutral-500: #6b7280;
-            --neutral-600: #4b5563;
-            --neutral-700: #374151;
-            --neutral-800: #1f2937;
-            --neutral-900: #111827;
-            
-            /* Functional colors */
-            --text-primary: #111827;
-            --text-secondary: #6b7280;
-            --border-color: #e5e7eb;
-            --bg-surface: #ffffff;
-            --bg-elevated: #f9fafb;
-            
-            /* User message colors */
-            --user-bg: #2563eb;
-            --user-text: #ffffff;
-            
-            /* Assistant message colors */
-            --assistant-bg: #f3f4f6;
-            --assistant-text: #111827;
-        }
-        
-        /* ===== DARK MODE ===== */
-        @media (prefers-color-scheme: dark) {
-            :root {
-                --text-primary: #e5e7eb;
-                --text-secondary: #9ca3af;
-                --border-color: #374151;
-                --bg-surface: #1f2937;
-                --bg-elevated: #111827;
-                --assistant-bg: #374151;
-                --assistant-text: #e5e7eb;
-            }
-        }
-        
-        /* ===== GLOBAL STYLES ===== */
-        * {
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
-            line-height: 1.6;
-            color: var(--text-primary);
-            background-color: var(--bg-surface);
-        }
-        
-        /* ===== MAIN CONTAINER ===== */
-        .main .block-container {
-            max-width: 900px;
-            margin: 0 auto;
-            padding: 0 1rem;
-        }
-        
-        /* ===== HEADER STYLING ===== */
-        .header-container {
-            display: flex;
-            align-items: center;
-            justify-content: space-between;
-            padding: 1.5rem 0 1rem 0;
-            border-bottom: 1px solid var(--border-color);
-        }
-        
-        .header-title {
-            font-size: 1.5rem;
-            font-weight: 600;
-            color: var(--text-primary);
-            margin: 0;
-            display: flex;
-            align-items: center;
-            gap: 0.75rem;
-        }
-        
-        .header-status {
-            display: flex;
-            align-items: center;
-            gap: 0.5rem;
-            font-size: 0.875rem;
-            font-weight: 500;
-        }
-        
-        .status-healthy {
-            color: #10b981;
-        }
-        
-        .status-error {
-            color: #ef4444;
-        }
-        
-        /* ===== WELCOME SECTION ===== */
-        .welcome-container {
-            max-width: 900px;
-            margin: 3rem auto;
-        }
-        
-        .welcome-header {
-            text-align: center;;
-        }
-        
-        .welcome-title {
-            font-size: 2.5rem;
-            font-weight: 700;
-            color: var(--text-primary);
-            margin-bottom: 0.5rem;
-            letter-spacing: -0.025em;
-        }
-        
-        .welcome-subtitle {
-            font-size: 1.125rem;
-            color: var(--text-secondary);
-            margin-bottom: 0;
-        }
-        
-        .features-grid {
-            display: grid;
-            grid-template-columns: repeat(3, minmax(200px, 1fr));
-            gap: 1.5rem;
-            margin: 2rem 0;
-        }
-        
-        .feature-card {
-            background-color: var(--bg-elevated);
-            border: 1px solid var(--border-color);
-            border-radius: 0.75rem;
-            padding: 1.5rem;
-            text-align: center;
-            transition: all 0.3s ease;
-        }
-        
-        .feature-card:hover {
-            border-color: var(--primary-500);
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.08);
-        }
-        
-        .feature-icon {
-            font-size: 2rem;
-            margin-bottom: 0.75rem;
-        }
-        
-        .feature-title {
-            font-weight: 600;
-            font-size: 1rem;
-            margin-bottom: 0.5rem;
-            color: var(--text-primary);
-        }
-        
-        .feature-description {
-            font-size: 0.875rem;
-            color: var(--text-secondary);
-        }
-        
-        /* ===== CHAT CONTAINER ===== */
-        .chat-wrapper {
-            display: flex;
-            flex-direction: column;
-            height: 100vh;
-            position: fixed;
-            top: 0;
-            left: 0;
-            right: 0;
-            z-index: 1;
-        }
-        
-        .chat-messages-container {
-            flex: 1;
-            overflow-y: auto;
-            padding: 1.5rem 0;
-            display: flex;
-            flex-direction: column;
-            gap: 1rem;
-            max-width: 900px;
-            margin: 4rem auto 0;
-            width: 100%;
-            padding-left: 1rem;
-            padding-right: 1rem;
-        }
-        
-        /* ===== CHAT MESSAGES ===== */
-        .message-group {
-            display: flex;
-            margin-bottom: 1rem;
-            animation: slideIn 0.3s ease-out;
-        }
-        
-        .message-group.user {
-            justify-content: flex-end;
-        }
-        
-        .message-group.assistant {
-            justify-content: flex-start;
-        }
-        
-        .message-bubble {
-            max-width: 70%;
-            padding: 0.75rem 1rem;
-            border-radius: 1rem;
-            word-wrap: break-word;
-            line-height: 1.5;
-            font-size: 0.95rem;
-        }
-        
-        .message-bubble.user {
-            background-color: var(--primary-500);
-            color: white;
-            border-bottom-right-radius: 0.25rem;
-            box-shadow: 0 2px 8px rgba(37, 99, 235, 0.2);
-        }
-        
-        .message-bubble.assistant {
-            background-color: var(--assistant-bg);
-            color: var(--assistant-text);
-            border-bottom-left-radius: 0.25rem;
-            border: 1px solid var(--border-color);
-        }
-        
-        .message-content {
-            margin: 0;
-            word-break: break-word;
-            white-space: pre-wrap;
-            overflow-wrap: break-word;
-        }
-        
-        .message-timestamp {
-            font-size: 0.75rem;
-            opacity: 0.6;
-            margin-top: 0.25rem;
-            padding: 0 0.25rem;
-        }
-        
-        /* Loading state */
-        .loading-dots {
-            display: inline-flex;
-            gap: 0.3rem;
-        }
-        
-        .loading-dot {
-            width: 0.4rem;
-            height: 0.4rem;
-            border-radius: 50%;
-            background-color: var(--assistant-text);
-            animation: bounce 1.4s infinite;
-        }
-        
-        .loading-dot:nth-child(1) {
-            animation-delay: 0s;
-        }
-        
-        .loading-dot:nth-child(2) {
-            animation-delay: 0.2s;
-        }
-        
-        .loading-dot:nth-child(3) {
-            animation-delay: 0.4s;
-        }
-        
-        @keyframes bounce {
-            0%, 80%, 100% {
-                transform: translateY(0);
-                opacity: 0.6;
-            }
-            40% {
-                transform: translateY(-0.8rem);
-                opacity: 1;
-            }
-        }
-        
-        /* ===== INPUT AREA ===== */
-        .input-container {
-            position: fixed;
-            bottom: 0;
-            left: 0;
-            right: 0;
-            background-color: var(--bg-surface);
-            border-top: 1px solid var(--border-color);
-            padding: 1.5rem;
-            max-width: 900px;
-            margin: 0 auto;
-            width: 100%;
-            z-index: 999;
-        }
-        
-        .input-form {
-            display: flex;
-            gap: 0.75rem;
-            align-items: flex-end;
-        }
-        
-        .input-area {
-            flex: 1;
-            display: flex;
-            flex-direction: column;
-            gap: 0.5rem;
-        }
-        
-        .stTextArea > div > div > textarea {
-            border: 1px solid var(--border-color) !important;
-            border-radius: 0.75rem !important;
-            background-color: var(--bg-elevated) !important;
-            color: var(--text-primary) !important;
-            font-size: 0.95rem !important;
-            resize: vertical !important;
-            max-height: 120px !important;
-        }
-        
-        .stTextArea > div > div > textarea:focus {
-            border-color: var(--primary-500) !important;
-            box-shadow: 0 0 0 2px rgba(37, 99, 235, 0.1) !important;
-        }
-        
-        .input-actions {
-            display: flex;
-            gap: 0.5rem;
-            justify-content: flex-end;
-        }
-        
-        .stButton > button {
-            border-radius: 0.5rem !important;
-            font-weight: 500 !important;
-            transition: all 0.2s ease !important;
-            height: 2.5rem;
-        }
-        
-        .stButton > button[type="primary"] {
-            background-color: var(--primary-500) !important;
-        }
-        
-        .stButton > button:hover {
-            transform: translateY(-1px) !important;
-            box-shadow: 0 4px 12px rgba(37, 99, 235, 0.25) !important;
-        }
-                
-        .st-emotion-cache-t1wise {
-            padding: 0rem 3rem 0rem;
-        }
-        
-        /* ===== SOURCES & CONTEXT ===== */
-        .sources-section {
-            margin-top: 1rem;
-            background-color: var(--bg-elevated);
-            border: 1px solid var(--border-color);
-            border-radius: 0.75rem;
-            padding: 1rem;
-        }
-        
-        .source-item {
-            padding: 0.75rem;
-            background-color: var(--bg-surface);
-            border-radius: 0.5rem;
-            border-left: 3px solid var(--primary-500);
-            margin-bottom: 0.75rem;
-            font-size: 0.875rem;
-        }
-        
-        .source-filename {
-            font-weight: 600;
-            color: var(--text-primary);
-            margin-bottom: 0.25rem;
-        }
-        
-        .source-preview {
-            color: var(--text-secondary);
-            line-height: 1.4;
-        }
-        
-        /* ===== SIDEBAR STYLING ===== */
-        .stSidebar {
-            background-color: var(--bg-elevated);
-        }
-        
-        .stSidebar [data-testid="stSidebarNav"] {
-            padding-top: 0;
-        }
-        
-        /* ===== ALERTS & MESSAGES ===== */
-        .stAlert {
-            border-radius: 0.75rem !important;
-            font-size: 0.95rem !important;
-        }
-        
-        .stInfo {
-            background-color: rgba(59, 130, 246, 0.1) !important;
-            border-color: var(--primary-500) !important;
-            border-left: 4px solid var(--primary-500) !important;
-        }
-        
-        .stSuccess {
-            background-color: rgba(16, 185, 129, 0.1) !important;
-            border-color: #10b981 !important;
-            border-left: 4px solid #10b981 !important;
-        }
-        
-        .stError {
-            background-color: rgba(239, 68, 68, 0.1) !important;
-            border-color: #ef4444 !important;
-            border-left: 4px solid #ef4444 !important;
-        }
-        
-        .stWarning {
-            background-color: rgba(245, 158, 11, 0.1) !important;
-            border-color: #f59e0b !important;
-            border-left: 4px solid #f59e0b !important;
-        }
-        
-        /* ===== EXPANDER ===== */
-        .streamlit-expanderHeader {
-            font-weight: 600 !important;
-            font-size: 0.95rem !important;
-            color: var(--text-primary) !important;
-        }
-        
-        /* ===== FILE UPLOADER ===== */
-        .stFileUploader {
-            border: 2px dashed var(--border-color) !important;
-            border-radius: 0.75rem !important;
-            background-color: var(--bg-elevated) !important;
-            padding: 1.5rem !important;
-        }
-        
-        .stFileUploader [data-testid="stFileUploadDropzone"] {
-            padding: 1rem !important;
-        }
-        
-        /* ===== METRIC CARDS ===== */
-        .stMetric {
-            background-color: var(--bg-elevated) !important;
-            padding: 1rem !important;
-            border-radius: 0.75rem !important;
-            border: 1px solid var(--border-color) !important;
-        }
-        
-        /* ===== DIVIDERS ===== */
-        hr {
-            border: none !important;
-            border-top: 1px solid var(--border-color) !important;
-            margin: 1rem 0 !important;
-        }
-        
-        /* ===== FOOTER ===== */
-        .footer {
-            text-align: center;
-            color: var(--text-secondary);
-            padding: 2rem 1rem;
-            border-top: 1px solid var(--border-color);
-            font-size: 0.875rem;
-        }
-        
-        /* ===== ANIMATIONS ===== */
-        @keyframes slideIn {
-            from {
-                opacity: 0;
-                transform: translateY(10px);
-            }
-            to {
-                opacity: 1;
-                transform: translateY(0);
-            }
-        }
-        
-        @keyframes fadeIn {
-            from {
-                opacity: 0;
-            }
-            to {
-                opacity: 1;
-            }
-        }
-        
-        /* ===== HIDE DEFAULTS ===== */
-        #MainMenu {
-            visibility: hidden;
-        }
-        
-        footer {
-            visibility: hidden;
-        }
-        
-        /* ===== RESPONSIVE DESIGN ===== */
-        @media (max-width: 768px) {
-            .main .block-container {
-                padding: 0 0.5rem;
-            }
-            
-            .message-bubble {
-                max-width: 85%;
-                font-size: 0.9rem;
-                padding: 0.65rem 0.85rem;
-            }
-            
-            .welcome-title {
-                font-size: 2rem;
-            }
-            
-            .features-grid {
-                grid-template-columns: 1fr;
-                gap: 1rem;
-            }
-            
-            .input-container {
-                padding: 1rem;
-            }
-            
-            .st-emotion-cache-t1wise {
-                padding: 0rem 0.5rem 0rem;
-            }
-        }
-    </style>
-    """, unsafe_allow_html=True)
+    # st.html injects the raw <style> tag without a pass through the markdown parser
+    st.html(_CSS_MIN)
+
+# =============================================================================
+# Static HTML Blocks
+# =============================================================================
+
+# Built once at import so reruns only pass the same strings to st.html
+_HEADER_TEMPLATE = """
+<div class="header-container">
+    <h1 class="header-title">💬 Chat with your Document</h1>
+    <div class="header-status">
+        {status}
+    </div>
+</div>
+"""
+_HEADER_CONNECTED_HTML = _HEADER_TEMPLATE.format(
+    status='🟢 <span class="status-healthy">Connected</span>'
+)
+_HEADER_DISCONNECTED_HTML = _HEADER_TEMPLATE.format(
+    status='🔴 <span class="status-error">Disconnected</span>'
+)
+
+_WELCOME_HTML = """
+<div class="welcome-container">
+    <div class="welcome-header">
+        <h1 class="welcome-title">Welcome to your AI Assistant</h1>
+        <p class="welcome-subtitle">Upload a document and start asking questions</p>
+    </div>
+</div>
+"""
+
+_FEATURES_HTML = """
+<div class="features-grid">
+    <div class="feature-card">
+        <div class="feature-icon">📄</div>
+        <div class="feature-title">Multi-Format</div>
+        <div class="feature-description">PDF, Word, Text, CSV, Images, SQLite</div>
+    </div>
+    <div class="feature-card">
+        <div class="feature-icon">🔍</div>
+        <div class="feature-title">Smart Search</div>
+        <div class="feature-description">Understand context, not just keywords</div>
+    </div>
+    <div class="feature-card">
+        <div class="feature-icon">🤖</div>
+        <div class="feature-title">AI Powered</div>
+        <div class="feature-description">GPT-4o for accurate answers</div>
+    </div>
+    <div class="feature-card">
+        <div class="feature-icon">👁️</div>
+        <div class="feature-title">Vision</div>
+        <div class="feature-description">Analyze images in documents</div>
+    </div>
+    <div class="feature-card">
+        <div class="feature-icon">📚</div>
+        <div class="feature-title">Sources</div>
+        <div class="feature-description">Trace answers back to documents</div>
+    </div>
+    <div class="feature-card">
+        <div class="feature-icon">⚡</div>
+        <div class="feature-title">Fast</div>
+        <div class="feature-description">Instant results with OCR support</div>
+    </div>
+</div>
+"""
+
+_FOOTER_HTML = """
+<div class="footer">
+    <strong>Multi-Modal RAG Assistant</strong><br>
+    Powered by LangChain • ChromaDB • OpenAI<br>
+    <small>© 2026 - Abdullah Al Raiyan</small>
+</div>
+"""
 
 # =============================================================================
 # Session State Initialization
 # =============================================================================
 
+# Built once at import; list defaults are copied per session before use
+_DEFAULT_STATE: Dict[str, Any] = {
+    "file_id": None,
+    "uploaded_filename": None,
+    "selected_file_ids": [],  # For multi-document selection
+    "selected_filenames": [],  # Corresponding filenames
+    "chat_history": [],
+    "visible_messages": CHAT_PAGE_SIZE,  # How many recent messages to render
+    "upload_progress": 0,
+    "theme": "light",
+    "show_sources": True,
+    "show_context": False,
+    "max_sources": 5,
+    "pending_question": None,  # For handling suggested question clicks
+    "pending_query": None,  # Question echoed in the chat, awaiting its answer
+    "use_hybrid_search": True,  # Enable hybrid search by default
+    "multi_doc_mode": False,  # Multi-document mode toggle
+}
+
 def init_session_state():
     """Initialize all session state variables with defaults."""
-    defaults = {
-        "file_id": None,
-        "uploaded_filename": None,
-        "selected_file_ids": [],  # For multi-document selection
-        "selected_filenames": [],  # Corresponding filenames
-        "chat_history": [],
-        "api_healthy": None,
-        "last_health_check": None,
-        "total_documents": 0,
-        "upload_progress": 0,
-        "theme": "light",
-        "show_sources": True,
-        "show_context": False,
-        "max_sources": 5,
-        "pending_question": None,  # For handling suggested question clicks
-        "use_hybrid_search": True,  # Enable hybrid search by default
-        "multi_doc_mode": False,  # Multi-document mode toggle
-    }
-    
-    for key, default in defaults.items():
+    for key, default in _DEFAULT_STATE.items():
         if key not in st.session_state:
-            st.session_state[key] = default
+            # Copy so sessions never share (and append to) the same list
+            st.session_state[key] = copy(default)
+
+def trim_chat_history():
+    """Drop the oldest messages (and their sources/context) beyond MAX_CHAT_HISTORY."""
+    overflow = len(st.session_state.chat_history) - MAX_CHAT_HISTORY
+    if overflow > 0:
+        del st.session_state.chat_history[:overflow]
+
+def queue_question(question: str):
+    """Hand a question to the chat fragment, which answers it on its next run."""
+    st.session_state.pending_question = question
+
+def show_earlier_messages():
+    """Widen the rendered message window by one page."""
+    st.session_state.visible_messages += CHAT_PAGE_SIZE
+
+def clear_chat_history():
+    """Start a new, empty conversation, including the message paging window."""
+    st.session_state.chat_history = []
+    st.session_state.visible_messages = CHAT_PAGE_SIZE
 
 # =============================================================================
 # API Helper Functions
@@ -635,6 +233,52 @@ class APIError(Exception):
         self.detail = detail
         super().__init__(self.message)
 
+@st.cache_resource(show_spinner=False)
+def get_http_client() -> requests.Session:
+    """
+    Get the shared HTTP client used for all backend calls.
+    
+    Cached as a Streamlit resource so every rerun and session in the process
+    reuses the same keep-alive connections to the backend. Failed connects and
+    gateway errors (502/503/504) on idempotent requests are retried briefly;
+    read timeouts are not, so a slow query fails after one REQUEST_TIMEOUT.
+    
+    Returns:
+        requests.Session instance
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=2,
+            read=0,  # Never resend a request the server may still be working on
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False  # Hand the final response to the normal error path
+        )
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_resource(show_spinner=False)
+def get_circuit_breaker() -> Dict[str, float]:
+    """
+    Get the process-wide circuit breaker state for the backend host.
+    
+    Held as a Streamlit resource because module globals are re-created
+    on every script rerun.
+    
+    Returns:
+        Mutable dict with the time until which requests should fail fast
+    """
+    return {"open_until": 0.0}
+
+def reset_circuit_breaker() -> None:
+    """Close the circuit breaker so the next request reaches the backend."""
+    get_circuit_breaker()["open_until"] = 0.0
+
 def make_api_request(
     method: str,
     endpoint: str,
@@ -656,19 +300,35 @@ def make_api_request(
     Raises:
         APIError: If the request fails
     """
+    breaker = get_circuit_breaker()
+    if time.time() < breaker["open_until"]:
+        # Backend was unreachable moments ago - fail fast instead of waiting on a timeout
+        raise APIError(
+            message="Connection failed",
+            detail="Cannot connect to the backend API. Please ensure the server is running."
+        )
+    
     url = f"{API_BASE_URL}/{endpoint.lstrip('/')}"
     
     try:
-        response = requests.request(method, url, timeout=timeout, **kwargs)
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            error_detail = "Unknown error"
+        # Context manager hands the connection back to the pool on every exit path
+        with get_http_client().request(method, url, timeout=timeout, **kwargs) as response:
+            if response.status_code == 200:
+                # HEAD responses carry no body to decode
+                if method.upper() == "HEAD":
+                    return {}
+                # orjson parses the raw bytes, skipping requests' decode-to-str step
+                return orjson.loads(response.content)
+            
             try:
-                error_data = response.json()
-                error_detail = error_data.get("detail", str(error_data))
-            except:
+                error_data = orjson.loads(response.content)
+                # Proxies and some handlers return a JSON list or string instead of an object
+                if isinstance(error_data, dict):
+                    error_detail = error_data.get("detail", str(error_data))
+                else:
+                    error_detail = str(error_data)
+            except ValueError:
+                # Non-JSON error body (e.g. a proxy error page)
                 error_detail = response.text or f"HTTP {response.status_code}"
             
             raise APIError(
@@ -677,12 +337,20 @@ def make_api_request(
                 detail=error_detail
             )
             
+    except requests.exceptions.ConnectTimeout:
+        # Caught before Timeout: an unreachable host should trip the breaker too
+        breaker["open_until"] = time.time() + CIRCUIT_BREAKER_COOLDOWN
+        raise APIError(
+            message="Connection failed",
+            detail="Cannot connect to the backend API. Please ensure the server is running."
+        )
     except requests.exceptions.Timeout:
         raise APIError(
             message="Request timed out",
             detail="The server is taking too long to respond. Please try again."
         )
     except requests.exceptions.ConnectionError:
+        breaker["open_until"] = time.time() + CIRCUIT_BREAKER_COOLDOWN
         raise APIError(
             message="Connection failed",
             detail="Cannot connect to the backend API. Please ensure the server is running."
@@ -695,31 +363,47 @@ def make_api_request(
             detail=str(e)
         )
 
-def check_api_health() -> Dict[str, Any]:
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_health(include_stats: bool = False) -> Dict[str, Any]:
+    """Probe /health; errors propagate so only healthy results are cached."""
+    if include_stats:
+        result = make_api_request("GET", "/health", timeout=HEALTH_CHECK_TIMEOUT)
+        total_documents = result.get("vectorstore", {}).get("total_documents", 0)
+    else:
+        try:
+            result = make_api_request("HEAD", "/health", timeout=HEALTH_CHECK_TIMEOUT)
+        except APIError as e:
+            # Backends without the HEAD /health route answer 405; the GET works everywhere
+            if e.status_code != 405:
+                raise
+            result = make_api_request("GET", "/health", timeout=HEALTH_CHECK_TIMEOUT)
+        total_documents = None
+    return {"healthy": True, "total_documents": total_documents, "data": result}
+
+@st.cache_data(ttl=15, show_spinner=False)
+def _cached_files() -> List[Dict]:
+    """Fetch /files; errors propagate so failures are never cached."""
+    return make_api_request("GET", "/files", timeout=FILE_LIST_TIMEOUT)
+
+def check_api_health(include_stats: bool = False) -> Dict[str, Any]:
     """
     Check if the backend API is healthy with caching.
     
+    A plain liveness check uses a body-less HEAD request; the full GET
+    (which scans the vectorstore for stats) is only issued when the caller
+    needs the document count.
+    
+    Args:
+        include_stats: Also fetch vectorstore statistics (total_documents)
+    
     Returns:
         Health status dictionary with stats
     """
-    # Use cached result if recent (within 30 seconds)
-    if (st.session_state.last_health_check and 
-        time.time() - st.session_state.last_health_check < 30 and
-        st.session_state.api_healthy is not None):
-        return {
-            "healthy": st.session_state.api_healthy,
-            "total_documents": st.session_state.total_documents
-        }
-    
     try:
-        result = make_api_request("GET", "/health", timeout=HEALTH_CHECK_TIMEOUT)
-        st.session_state.api_healthy = True
-        st.session_state.total_documents = result.get("vectorstore", {}).get("total_documents", 0)
-        st.session_state.last_health_check = time.time()
-        return {"healthy": True, "total_documents": st.session_state.total_documents, "data": result}
+        return _cached_health(include_stats)
     except APIError:
-        st.session_state.api_healthy = False
-        st.session_state.last_health_check = time.time()
+        # Not cached: one session's failed probe must not mark the backend
+        # down for every other session
         return {"healthy": False, "total_documents": 0}
 
 def upload_document(uploaded_file) -> bool:
@@ -733,27 +417,39 @@ def upload_document(uploaded_file) -> bool:
         True if successful, False otherwise
     """
     try:
-        file_data = uploaded_file.getvalue()
-        files = {
-            "file": (
-                uploaded_file.name,
-                file_data,
-                uploaded_file.type or "application/octet-stream"
-            )
-        }
+        # Stream the multipart body from the file object instead of
+        # building a second in-memory copy of the whole file
+        uploaded_file.seek(0)
+        encoder = MultipartEncoder(
+            fields={
+                "file": (
+                    uploaded_file.name,
+                    uploaded_file,
+                    uploaded_file.type or "application/octet-stream"
+                )
+            }
+        )
         
         progress_bar = st.progress(0, text="Uploading file...")
         progress_bar.progress(30, text="Processing document...")
         
-        result = make_api_request("POST", "/upload", files=files)
+        result = make_api_request(
+            "POST",
+            "/upload",
+            data=encoder,
+            headers={"Content-Type": encoder.content_type}
+        )
         
-        progress_bar.progress(100, text="Complete!")
-        time.sleep(0.5)  # Brief pause to show completion
         progress_bar.empty()
         
+        # New upload must show up in the file list and the document count
+        _cached_files.clear()
+        _cached_health.clear()
+        
         st.session_state.file_id = result["file_id"]
         st.session_state.uploaded_filename = result["filename"]
-        st.session_state.chat_history = []  # Clear chat history for new document
+        clear_chat_history()  # Clear chat history for new document
+        st.session_state.pop("file_table", None)  # Row indices shift with the new file
         
         st.success(f"✅ {result['message']}")
         return True
@@ -814,7 +510,7 @@ def query_document(question: str) -> Optional[Dict]:
             "POST",
             "/query",
             headers={"Content-Type": "application/json"},
-            data=json.dumps(payload)
+            data=orjson.dumps(payload)
         )
         
         return result
@@ -831,30 +527,83 @@ def get_uploaded_files() -> List[Dict]:
         List of file dictionaries
     """
     try:
-        return make_api_request("GET", "/files")
+        return _cached_files()
     except APIError:
         return []
 
+@st.cache_resource(show_spinner=False)
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Get the shared thread pool for concurrent backend calls.
+    
+    Cached as a Streamlit resource so reruns reuse the same worker threads
+    instead of spawning and joining a pool each time. Each page load holds
+    two workers for at most the health/file-list timeouts, so the pool is
+    sized for BACKEND_POOL_WORKERS / 2 sessions loading at once; threads are
+    only started as load requires.
+    
+    Returns:
+        ThreadPoolExecutor instance
+    """
+    return ThreadPoolExecutor(max_workers=BACKEND_POOL_WORKERS, thread_name_prefix="backend")
+
+def fetch_backend_state(include_stats: bool = False) -> Tuple[Dict[str, Any], List[Dict]]:
+    """
+    Fetch API health and the uploaded file list concurrently.
+    
+    Both calls are independent round-trips on the pooled session, so running
+    them side by side makes the page wait for the slower one instead of both.
+    
+    Args:
+        include_stats: Fetch vectorstore statistics with the health check
+    
+    Returns:
+        Tuple of (health status dictionary, list of file dictionaries)
+    """
+    # Both calls only go through st.cache_data and the HTTP client, never
+    # session_state, so the workers need no script run context
+    pool = get_executor()
+    health_future = pool.submit(check_api_health, include_stats)
+    files_future = pool.submit(get_uploaded_files)
+    return health_future.result(), files_future.result()
+
 # =============================================================================
 # UI Components
 # =============================================================================
 
 def render_header():
     """Render the modern header with document status."""
-    st.markdown(
-        f"""
-        <div class="header-container">
-            <h1 class="header-title">💬 Chat with your Document</h1>
-            <div class="header-status">
-                {('🟢 <span class="status-healthy">Connected</span>' if check_api_health()["healthy"] else '🔴 <span class="status-error">Disconnected</span>')}
-            </div>
-        </div>
-        """,
-        unsafe_allow_html=True
+    st.html(
+        _HEADER_CONNECTED_HTML if check_api_health()["healthy"] else _HEADER_DISCONNECTED_HTML
     )
 
-def render_sidebar():
-    """Render the sidebar with document upload and settings."""
+def use_selected_file(files: List[Dict]):
+    """
+    Switch to the document picked in the sidebar file table.
+    
+    Runs as the table's on_select callback, so it only fires when the
+    selection actually changes.
+    
+    Args:
+        files: File list the table was rendered from
+    """
+    selected_rows = st.session_state.file_table["selection"]["rows"]
+    if not selected_rows:
+        return
+    
+    file_info = files[selected_rows[0]]
+    if file_info['file_id'] != st.session_state.file_id:
+        st.session_state.file_id = file_info['file_id']
+        st.session_state.uploaded_filename = file_info['filename']
+        clear_chat_history()
+
+def render_sidebar(files: List[Dict]):
+    """
+    Render the sidebar with document upload and settings.
+    
+    Args:
+        files: Uploaded file list, fetched once per rerun by the caller
+    """
     with st.sidebar:
         st.header("📁 Document Management")
         
@@ -876,7 +625,7 @@ def render_sidebar():
         
         if uploaded_file is not None:
             # Show file preview info
-            file_size = len(uploaded_file.getvalue())
+            file_size = uploaded_file.size
             st.info(f"📎 **{uploaded_file.name}**\n\nSize: {file_size / 1024:.1f} KB")
             
             col1, col2 = st.columns(2)
@@ -892,15 +641,14 @@ def render_sidebar():
         
         # Current document info
         if st.session_state.file_id:
-            st.markdown(
+            st.html(
                 f"""
                 <div class="file-info-card">
                     <strong>📄 Active Document</strong><br>
                     {st.session_state.uploaded_filename}<br>
                     <small>ID: {st.session_state.file_id[:8]}...</small>
                 </div>
-                """,
-                unsafe_allow_html=True
+                """
             )
             
             col1, col2 = st.columns(2)
@@ -908,26 +656,29 @@ def render_sidebar():
                 if st.button("🗑️ Clear", use_container_width=True, help="Remove current document"):
                     st.session_state.file_id = None
                     st.session_state.uploaded_filename = None
-                    st.session_state.chat_history = []
+                    clear_chat_history()
+                    st.session_state.pop("file_table", None)  # Let the same row be picked again
                     st.rerun()
             with col2:
                 if st.button("🔄 Refresh", use_container_width=True, help="Refresh API connection"):
-                    st.session_state.last_health_check = None
+                    reset_circuit_breaker()
+                    _cached_health.clear()
+                    _cached_files.clear()
                     st.rerun()
         
         st.divider()
         
         # Search Settings section
         with st.expander("🔍 Search Settings", expanded=False):
-            st.session_state.use_hybrid_search = st.toggle(
+            st.toggle(
                 "Hybrid Search",
-                value=st.session_state.use_hybrid_search,
+                key="use_hybrid_search",
                 help="Combine vector similarity with keyword matching (BM25) for better recall"
             )
             
-            st.session_state.multi_doc_mode = st.toggle(
+            st.toggle(
                 "Multi-Document Mode",
-                value=st.session_state.multi_doc_mode,
+                key="multi_doc_mode",
                 help="Query across multiple documents at once"
             )
             
@@ -939,34 +690,35 @@ def render_sidebar():
         # Multi-Document Selection
         if st.session_state.multi_doc_mode:
             with st.expander("📚 Select Documents to Query", expanded=True):
-                files = get_uploaded_files()
                 if files:
                     st.caption("Select multiple documents to search across:")
                     
-                    # Create checkboxes for each file
-                    selected_ids = []
-                    selected_names = []
+                    # One multiselect instead of a checkbox per file
+                    filenames = {file_info['file_id']: file_info['filename'] for file_info in files}
                     
-                    for file_info in files:
-                        file_id = file_info['file_id']
-                        filename = file_info['filename']
-                        is_selected = file_id in st.session_state.selected_file_ids
-                        
-                        if st.checkbox(
-                            f"📄 {filename[:30]}{'...' if len(filename) > 30 else ''}",
-                            value=is_selected,
-                            key=f"multi_select_{file_id}",
-                            help=f"ID: {file_id[:8]}..."
-                        ):
-                            selected_ids.append(file_id)
-                            selected_names.append(filename)
+                    # Seed from the saved selection and drop files that no longer exist,
+                    # before the widget is created
+                    st.session_state.multi_select = [
+                        file_id
+                        for file_id in st.session_state.get("multi_select", st.session_state.selected_file_ids)
+                        if file_id in filenames
+                    ]
+                    selected_ids = st.multiselect(
+                        "Documents",
+                        options=list(filenames),
+                        format_func=lambda file_id: f"📄 {filenames[file_id]}",
+                        key="multi_select",
+                        placeholder="Choose documents",
+                        label_visibility="collapsed"
+                    )
+                    selected_names = [filenames[file_id] for file_id in selected_ids]
                     
                     # Update session state
                     if selected_ids != st.session_state.selected_file_ids:
                         st.session_state.selected_file_ids = selected_ids
                         st.session_state.selected_filenames = selected_names
                         if selected_ids:
-                            st.session_state.chat_history = []  # Clear chat when selection changes
+                            clear_chat_history()  # Clear chat when selection changes
                     
                     if selected_ids:
                         st.success(f"📊 {len(selected_ids)} document(s) selected")
@@ -977,43 +729,47 @@ def render_sidebar():
         
         # Settings section
         with st.expander("⚙️ Display Settings", expanded=False):
-            st.session_state.show_sources = st.toggle(
+            st.toggle(
                 "Show Sources",
-                value=st.session_state.show_sources,
+                key="show_sources",
                 help="Display source documents for answers"
             )
             
-            st.session_state.show_context = st.toggle(
+            st.toggle(
                 "Show Context",
-                value=st.session_state.show_context,
+                key="show_context",
                 help="Display retrieved context used for answers"
             )
             
-            st.session_state.max_sources = st.slider(
+            st.slider(
                 "Max Sources to Display",
                 min_value=1,
                 max_value=10,
-                value=st.session_state.max_sources,
+                key="max_sources",
                 help="Maximum number of source documents to show"
             )
         
         # Single document file browser (when not in multi-doc mode)
         if not st.session_state.multi_doc_mode:
             with st.expander("📚 All Uploaded Files", expanded=False):
-                files = get_uploaded_files()
                 if files:
-                    for file_info in files:
-                        col1, col2 = st.columns([3, 1])
-                        with col1:
-                            st.text(f"📄 {file_info['filename'][:20]}...")
-                        with col2:
-                            if st.button("Use", key=f"use_{file_info['file_id']}", help="Select this document"):
-                                st.session_state.file_id = file_info['file_id']
-                                st.session_state.uploaded_filename = file_info['filename']
-                                st.session_state.chat_history = []
-                                st.rerun()
+                    # One selectable table instead of a text + button pair per file
+                    st.dataframe(
+                        [{"Document": f"📄 {file_info['filename']}"} for file_info in files],
+                        key="file_table",
+                        on_select=lambda: use_selected_file(files),
+                        selection_mode="single-row",
+                        hide_index=True,
+                        use_container_width=True
+                    )
+                    st.caption("Select a row to use that document")
                 else:
                     st.info("No files uploaded yet")
+                
+                if st.button("🔄 Refresh list", key="refresh_file_list", use_container_width=True):
+                    reset_circuit_breaker()
+                    _cached_files.clear()
+                    st.rerun()
         
         # Help section
         st.divider()
@@ -1035,6 +791,50 @@ def render_sidebar():
             - `Ctrl+K` - Focus search
             """)
 
+def render_source_html(source: Dict[str, Any]) -> str:
+    """
+    Build the card HTML for a source document, including its content.
+    
+    Args:
+        source: Source dictionary from the query response
+        
+    Returns:
+        HTML string for the source card
+    """
+    search_type = source.get('search_type', 'vector')
+    search_badge = {
+        'hybrid': '🔀 Hybrid',
+        'vector': '🎯 Vector',
+        'bm25': '🔤 Keyword'
+    }.get(search_type, '🔍')
+    
+    # Build score display
+    score_parts = []
+    if source.get('relevance_score'):
+        score_parts.append(f"<strong>Score:</strong> {source.get('relevance_score', 0):.1%}")
+    if source.get('vector_score'):
+        score_parts.append(f"<strong>Vector:</strong> {source.get('vector_score', 0):.1%}")
+    if source.get('bm25_score'):
+        score_parts.append(f"<strong>BM25:</strong> {source.get('bm25_score', 0):.1%}")
+    score_display = " | ".join(score_parts) if score_parts else ""
+    
+    # Chunk text is shown verbatim (newlines kept by white-space: pre-wrap)
+    source_content = html.escape(source.get('content', 'No preview available'))
+    
+    rows = [
+        f'<div class="source-filename">📄 {source.get("filename", "Unknown")} '
+        f'<span style="font-size: 0.8em; opacity: 0.7;">{search_badge}</span></div>'
+    ]
+    if source.get('page_number'):
+        rows.append(f'<div class="source-preview"><strong>Page:</strong> {source.get("page_number")}</div>')
+    if source.get('chunk_index') is not None:
+        rows.append(f'<div class="source-preview"><strong>Chunk:</strong> {source.get("chunk_index")}</div>')
+    if score_display:
+        rows.append(f'<div class="source-preview">{score_display}</div>')
+    rows.append(f'<div class="source-content">{source_content}</div>')
+    
+    return f'<div class="source-item">{"".join(rows)}</div>'
+
 def render_chat_message(role: str, content: str, timestamp: str = None, sources: List = None, context: str = None, suggested_questions: List[str] = None, is_last_message: bool = False):
     """
     Render a modern chat message bubble.
@@ -1048,120 +848,88 @@ def render_chat_message(role: str, content: str, timestamp: str = None, sources:
         suggested_questions: Optional list of follow-up question suggestions
         is_last_message: Whether this is the last message (to show suggestions)
     """
-    bubble_class = "user" if role == "user" else "assistant"
-    
-    # Render message bubble
-    st.markdown(
-        f"""
-        <div class="message-group {bubble_class}">
-            <div class="message-bubble {bubble_class}">
-                <p class="message-content">{content}</p>
-                {f'<div class="message-timestamp">{timestamp}</div>' if timestamp else ''}
-            </div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-    
-    # Render sources if available and assistant message
-    if role == "assistant" and sources and st.session_state.show_sources:
-        with st.expander(f"📚 {len(sources)} Source(s)", expanded=False):
-            for i, source in enumerate(sources[:st.session_state.max_sources], 1):
-                source_content = source.get('content', 'No preview available')
-                search_type = source.get('search_type', 'vector')
-                search_badge = {
-                    'hybrid': '🔀 Hybrid',
-                    'vector': '🎯 Vector',
-                    'bm25': '🔤 Keyword'
-                }.get(search_type, '🔍')
-                
-                # Build score display
-                score_parts = []
-                if source.get('relevance_score'):
-                    score_parts.append(f"<strong>Score:</strong> {source.get('relevance_score', 0):.1%}")
-                if source.get('vector_score'):
-                    score_parts.append(f"<strong>Vector:</strong> {source.get('vector_score', 0):.1%}")
-                if source.get('bm25_score'):
-                    score_parts.append(f"<strong>BM25:</strong> {source.get('bm25_score', 0):.1%}")
-                score_display = " | ".join(score_parts) if score_parts else ""
-                
-                st.markdown(
-                    f"""
-                    <div class="source-item">
-                        <div class="source-filename">📄 {source.get('filename', 'Unknown')} <span style="font-size: 0.8em; opacity: 0.7;">{search_badge}</span></div>
-                        {f'<div class="source-preview"><strong>Page:</strong> {source.get("page_number")}</div>' if source.get('page_number') else ''}
-                        {f'<div class="source-preview"><strong>Chunk:</strong> {source.get("chunk_index")}</div>' if source.get('chunk_index') is not None else ''}
-                        {f'<div class="source-preview">{score_display}</div>' if score_display else ''}
-                    </div>
-                    """,
-                    unsafe_allow_html=True
-                )
-                # Show full content in a text area for better readability
-                st.text_area(
-                    f"Content from source {i}",
-                    source_content,
-                    height=150,
-                    disabled=True,
-                    label_visibility="collapsed",
-                    key=f"source_content_{id(source)}_{i}"
+    # Native chat bubble - no HTML string building or markdown HTML parsing
+    with st.chat_message(role):
+        # Content and timestamp share one element to keep per-message deltas low
+        st.markdown(f"{content}\n\n:gray[{timestamp}]" if timestamp else content)
+
+        # Render sources if available and assistant message
+        if role == "assistant" and sources and st.session_state.show_sources:
+            with st.expander(f"📚 {len(sources)} Source(s)", expanded=False):
+                # One element for all cards instead of a card and a text area per source
+                st.html(
+                    "".join(
+                        render_source_html(source)
+                        for source in sources[:st.session_state.max_sources]
+                    )
                 )
     
-    # Render context if available and enabled
-    if role == "assistant" and context and st.session_state.show_context:
-        with st.expander("📄 Retrieved Context", expanded=False):
-            st.text_area(
-                "Full context used for this answer",
-                context,
-                height=300,
-                disabled=True,
-                label_visibility="collapsed",
-                key=f"context_{hash(content)}"
-            )
+        # Render context if available and enabled
+        if role == "assistant" and context and st.session_state.show_context:
+            with st.expander("📄 Retrieved Context", expanded=False):
+                # Static scroll box rather than a disabled text_area widget
+                st.html(f'<div class="source-content context-content">{html.escape(context)}</div>')
     
-    # Render suggested questions for the last assistant message
-    if role == "assistant" and is_last_message and suggested_questions:
-        st.markdown(
-            """
-            <div style="margin-top: 0.5rem; margin-bottom: 0.5rem;">
-                <span style="font-size: 0.85rem; color: var(--text-secondary);">💡 Follow-up questions:</span>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-        cols = st.columns(len(suggested_questions))
-        for i, (col, question) in enumerate(zip(cols, suggested_questions)):
-            with col:
-                if st.button(
-                    question[:50] + "..." if len(question) > 50 else question,
-                    key=f"suggested_q_{i}_{hash(question)}",
-                    use_container_width=True,
-                    help=question
-                ):
-                    st.session_state.pending_question = question
-                    st.rerun()
+        # Render suggested questions for the last assistant message
+        if role == "assistant" and is_last_message and suggested_questions:
+            st.html(
+                """
+                <div style="margin-top: 0.5rem; margin-bottom: 0.5rem;">
+                    <span style="font-size: 0.85rem; color: var(--text-secondary);">💡 Follow-up questions:</span>
+                </div>
+                """
+            )
+            cols = st.columns(len(suggested_questions))
+            for i, (col, question) in enumerate(zip(cols, suggested_questions)):
+                with col:
+                    # on_click runs before the next run, so the question is picked
+                    # up straight away without an extra rerun
+                    st.button(
+                        question[:50] + "..." if len(question) > 50 else question,
+                        key=f"suggested_q_{i}",  # Only the last answer shows suggestions
+                        use_container_width=True,
+                        help=question,
+                        on_click=queue_question,
+                        args=(question,)
+                    )
 
+@st.fragment
 def render_chat_interface():
-    """Render the main chat interface with fixed input at bottom."""
-    # Handle pending question from suggested questions click
-    if "pending_question" in st.session_state and st.session_state.pending_question:
-        pending_q = st.session_state.pending_question
+    """
+    Render the chat history, the pending answer and the chat action buttons.
+    
+    Runs as a fragment, so its buttons (suggested questions, load earlier,
+    clear) rerun only this function and skip the health check, sidebar and
+    file list. The chat input itself lives in main(): inside a fragment it
+    would lose its pinned position at the bottom of the page.
+    """
+    # A typed (from main) or clicked suggested question is shown and answered in this same run
+    if st.session_state.pending_question:
+        question = st.session_state.pending_question
         st.session_state.pending_question = None
-        process_question(pending_q)
-        return
+        process_question(question)
     
     # Chat messages container (scrollable)
     if not st.session_state.chat_history:
-        st.markdown(
+        st.html(
             """
             <div style="text-align: center; padding: 3rem 1rem; color: var(--text-secondary);">
                 <p style="font-size: 3rem;">No messages yet. Start a conversation! 💬</p>
             </div>
-            """,
-            unsafe_allow_html=True
+            """
         )
     else:
+        # Only the most recent messages are rendered; older ones load on demand
         total_messages = len(st.session_state.chat_history)
-        for idx, message in enumerate(st.session_state.chat_history):
+        hidden_messages = max(total_messages - st.session_state.visible_messages, 0)
+        if hidden_messages:
+            st.button(
+                f"⬆️ Load earlier messages ({hidden_messages} hidden)",
+                key="load_earlier",
+                on_click=show_earlier_messages
+            )
+        
+        for idx, message in enumerate(st.session_state.chat_history[hidden_messages:], start=hidden_messages):
             is_last = (idx == total_messages - 1)
             render_chat_message(
                 role=message["role"],
@@ -1173,29 +941,31 @@ def render_chat_interface():
                 is_last_message=is_last
             )
     
- 
+    # Answer the question echoed above and render the reply below it
+    if st.session_state.pending_query:
+        pending_query = st.session_state.pending_query
+        st.session_state.pending_query = None
+        resolve_question(pending_query)
+    
     
     # Action buttons row - only show when there are messages
     if st.session_state.chat_history:
         col1, col2 = st.columns([1, 1], gap="small")
         
         with col1:
-            if st.button("🔄 Clear Chat", use_container_width=True, help="Clear chat history"):
-                st.session_state.chat_history = []
-                st.rerun()
+            st.button(
+                "🔄 Clear Chat",
+                use_container_width=True,
+                help="Clear chat history",
+                on_click=clear_chat_history
+            )
         
         with col2:
             if st.button("📥 Export Chat", use_container_width=True, help="Export chat"):
                 export_chat_history()
     
-    # Determine if we have documents to query
-    has_documents = (
-        (st.session_state.multi_doc_mode and st.session_state.selected_file_ids) or
-        (not st.session_state.multi_doc_mode and st.session_state.file_id)
-    )
-    
-    # Show current search mode info
-    if has_documents and not st.session_state.chat_history:
+    # Show current search mode info (main only renders the chat once a document is selected)
+    if not st.session_state.chat_history:
         if st.session_state.multi_doc_mode:
             doc_count = len(st.session_state.selected_file_ids)
             search_type = "Hybrid (Vector + BM25)" if st.session_state.use_hybrid_search else "Vector"
@@ -1203,37 +973,40 @@ def render_chat_interface():
         elif st.session_state.use_hybrid_search:
             st.info(f"🔍 **Hybrid search** enabled on: {st.session_state.uploaded_filename}")
     
-    # Use chat_input for better UX - handles Enter key and clears automatically
-    if has_documents:
-        placeholder = (
-            f"Ask anything about your {len(st.session_state.selected_file_ids)} selected documents..."
-            if st.session_state.multi_doc_mode
-            else "Ask anything about your document..."
-        )
-        question = st.chat_input(placeholder, key="chat_input")
-        if question:
-            process_question(question)
-    else:
-        st.chat_input("Please upload or select a document first...", disabled=True, key="chat_input_disabled")
+    # Only show footer if no messages yet
+    if not st.session_state.chat_history:
+        render_footer()
 
 def process_question(question: str):
     """
-    Process a user question and get AI response.
-    Uses st.status for better loading UX without full page rerun.
+    Add a user question to the chat and queue it for an answer.
+    
+    Called before the history is rendered, so the user's message shows up
+    before the backend is called; resolve_question answers it later in the same run.
     
     Args:
         question: User's question text
     """
-    timestamp = datetime.now().strftime("%H:%M")
-    
     # Add user message to history
     user_message = {
         "role": "user",
         "content": question,
-        "timestamp": timestamp
+        "timestamp": datetime.now().strftime("%H:%M")
     }
     st.session_state.chat_history.append(user_message)
+    # Trim here too: failed queries append a question but no answer
+    trim_chat_history()
+    st.session_state.pending_query = question
+
+def resolve_question(question: str):
+    """
+    Get the AI response for a question already shown in the chat.
+    Uses st.status for better loading UX, then renders the reply in place
+    instead of rerunning.
     
+    Args:
+        question: User's question text
+    """
     # Use status container for better loading feedback
     with st.status("Processing your question...", expanded=True) as status:
         st.write("🔍 Searching document...")
@@ -1253,12 +1026,21 @@ def process_question(question: str):
                 "suggested_questions": result.get("suggested_questions", [])
             }
             st.session_state.chat_history.append(assistant_message)
+            trim_chat_history()
             status.update(label="✅ Response ready!", state="complete", expanded=False)
         else:
             status.update(label="❌ Failed to get response", state="error", expanded=False)
+            return
     
-    # Rerun to display the new messages in chat
-    st.rerun()
+    render_chat_message(
+        role="assistant",
+        content=assistant_message["content"],
+        timestamp=assistant_message["timestamp"],
+        sources=assistant_message["sources"],
+        context=assistant_message["context"],
+        suggested_questions=assistant_message["suggested_questions"],
+        is_last_message=True
+    )
 
 def export_chat_history():
     """Export chat history as a downloadable file."""
@@ -1273,67 +1055,27 @@ def export_chat_history():
         "messages": st.session_state.chat_history
     }
     
-    json_str = json.dumps(export_data, indent=2)
+    # Compact output: indenting roughly doubles the size of large contexts
+    json_bytes = orjson.dumps(export_data)
     
     st.download_button(
         label="📥 Download JSON",
-        data=json_str,
+        data=json_bytes,
         file_name=f"chat_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
         mime="application/json"
     )
 
-def render_welcome_screen():
-    """Render a clean, modern welcome screen."""
-    st.markdown(
-        """
-        <div class="welcome-container">
-            <div class="welcome-header">
-                <h1 class="welcome-title">Welcome to your AI Assistant</h1>
-                <p class="welcome-subtitle">Upload a document and start asking questions</p>
-            </div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+def render_welcome_screen(health: Dict[str, Any]):
+    """
+    Render a clean, modern welcome screen.
+    
+    Args:
+        health: Health status from this run's check_api_health call
+    """
+    st.html(_WELCOME_HTML)
     
     # Features grid
-    st.markdown(
-        """
-        <div class="features-grid">
-            <div class="feature-card">
-                <div class="feature-icon">📄</div>
-                <div class="feature-title">Multi-Format</div>
-                <div class="feature-description">PDF, Word, Text, CSV, Images, SQLite</div>
-            </div>
-            <div class="feature-card">
-                <div class="feature-icon">🔍</div>
-                <div class="feature-title">Smart Search</div>
-                <div class="feature-description">Understand context, not just keywords</div>
-            </div>
-            <div class="feature-card">
-                <div class="feature-icon">🤖</div>
-                <div class="feature-title">AI Powered</div>
-                <div class="feature-description">GPT-4o for accurate answers</div>
-            </div>
-            <div class="feature-card">
-                <div class="feature-icon">👁️</div>
-                <div class="feature-title">Vision</div>
-                <div class="feature-description">Analyze images in documents</div>
-            </div>
-            <div class="feature-card">
-                <div class="feature-icon">📚</div>
-                <div class="feature-title">Sources</div>
-                <div class="feature-description">Trace answers back to documents</div>
-            </div>
-            <div class="feature-card">
-                <div class="feature-icon">⚡</div>
-                <div class="feature-title">Fast</div>
-                <div class="feature-description">Instant results with OCR support</div>
-            </div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+    st.html(_FEATURES_HTML)
     
     col1, col2, col3 = st.columns(3)
     with col2:
@@ -1341,8 +1083,9 @@ def render_welcome_screen():
     
     st.divider()
     
-    # API health check
-    health = check_api_health()
+    # API health check - stats are missing if the sidebar cleared the selection this run
+    if health["total_documents"] is None:
+        health = check_api_health(include_stats=True)
     if health["healthy"]:
         st.success(f"🟢 **System Ready** • {health['total_documents']} documents indexed")
     else:
@@ -1350,16 +1093,7 @@ def render_welcome_screen():
 
 def render_footer():
     """Render the application footer."""
-    st.markdown(
-        """
-        <div class="footer">
-            <strong>Multi-Modal RAG Assistant</strong><br>
-            Powered by LangChain • ChromaDB • OpenAI<br>
-            <small>© 2026 - Abdullah Al Raiyan</small>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+    st.html(_FOOTER_HTML)
 
 # =============================================================================
 # Main Application
@@ -1371,8 +1105,15 @@ def main():
     init_session_state()
     apply_custom_styles()
     
-    # Check API health
-    health = check_api_health()
+    # The welcome screen shows the document count, so fetch stats along with
+    # the health check whenever no document is selected yet
+    needs_stats = not (
+        (st.session_state.multi_doc_mode and st.session_state.selected_file_ids) or
+        (not st.session_state.multi_doc_mode and st.session_state.file_id)
+    )
+    
+    # Check API health and load the file list in parallel
+    health, files = fetch_backend_state(include_stats=needs_stats)
     
     if not health["healthy"]:
         st.error("""
@@ -1384,16 +1125,16 @@ def main():
         """)
         
         if st.button("🔄 Retry Connection"):
-            st.session_state.last_health_check = None
+            reset_circuit_breaker()
             st.rerun()
         
         st.stop()
     
     # Render UI
     # render_header()
-    render_sidebar()
+    render_sidebar(files)
     
-    # Determine if we have documents to chat with
+    # Determine if we have documents to chat with (sidebar widgets may have changed it)
     has_documents = (
         (st.session_state.multi_doc_mode and st.session_state.selected_file_ids) or
         (not st.session_state.multi_doc_mode and st.session_state.file_id)
@@ -1401,12 +1142,20 @@ def main():
     
     # Main content area
     if has_documents:
+        # Called outside the chat fragment, whose body Streamlit wraps in a container,
+        # so the input stays pinned to the bottom of the page; the fragment picks up
+        # the question from pending_question
+        placeholder = (
+            f"Ask anything about your {len(st.session_state.selected_file_ids)} selected documents..."
+            if st.session_state.multi_doc_mode
+            else "Ask anything about your document..."
+        )
+        question = st.chat_input(placeholder, key="chat_input")
+        if question:
+            queue_question(question)
         render_chat_interface()
-        # Only show footer if no messages yet
-        if not st.session_state.chat_history:
-            render_footer()
     else:
-        render_welcome_screen()
+        render_welcome_screen(health)
         render_footer()
 
 # =============================================================================